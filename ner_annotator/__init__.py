@@ -6,6 +6,7 @@ NER annotator package initialization
 from .config import *
 from .annotator import NERAnnotator
 from .model import load_model
+from .reader import LineFile
 
 
 __version__ = '0.1.1'
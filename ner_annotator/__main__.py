@@ -5,6 +5,7 @@ NER annotator entry point
 
 import sys
 import os
+import stat
 import argparse
 import json
 
@@ -15,23 +16,37 @@ import ner_annotator
 
 def is_file_valid(path, valid_fmts):
     '''
-    Check if the given file is valid
+    Check if the given file has a valid extension
     '''
-    if not os.path.isfile(path):
-        raise Exception(
-            'The input path you entered does not exist or is not a file'
-        )
-
-    _, file_extension = os.path.splitext(path)
+    file_extension = (
+        '.' + path.rsplit('.', 1)[-1].lower() if '.' in path else ''
+    )
     if file_extension not in valid_fmts:
         raise Exception(
             'The input file you entered has an invalid extension. '
-            f'Please enter a file with one of the following formats: {valid_fmts}'
+            'Please enter a file with one of the following formats: '
+            f'{", ".join(valid_fmts)}'
         )
 
     return True
 
 
+def open_input_file(path):
+    '''
+    Open the given input file in binary mode, checking that
+    it exists and that it is a regular file
+    '''
+    error = 'The input path you entered does not exist or is not a file'
+    try:
+        f = open(path, 'rb')
+    except OSError:
+        raise Exception(error)
+    if not stat.S_ISREG(os.fstat(f.fileno()).st_mode):
+        f.close()
+        raise Exception(error)
+    return f
+
+
 def find_config_entities(config_json, config_model):
     '''
     Return the config model entities, given the config json
@@ -87,33 +102,27 @@ def main():
     args = parser.parse_args()
 
     if is_file_valid(args.input, ner_annotator.VALID_IN_FMT):
-        input_file = open(args.input, 'r').read().splitlines()
         if args.output is None:
             args.output = (
                 os.path.abspath(os.path.join(
                     os.path.dirname(args.input), 'output.json'
                 ))
             )
-        elif not is_file_valid(args.output, ner_annotator.VALID_OUT_FMT):
-            raise Exception(
-                f'The output file has an invalid extension: choose between {ner_annotator.VALID_OUT_FMT}'
-            )
-        if args.model is not None and not os.path.exists(args.model):
-            raise Exception(
-                'The given NER model does not exist'
-            )
+        else:
+            is_file_valid(args.output, ner_annotator.VALID_OUT_FMT)
         entities = args.entities
         if args.config is not None:
-            if not os.path.exists(args.config):
-                raise Exception(
-                    'The given config file does not exist'
-                )
             if args.config_model is None:
                 raise Exception(
                     'You have to enter the name of the config model to use'
                 )
-            with open(args.config, 'r') as f:
-                data = f.read()
+            try:
+                with open(args.config, 'r') as f:
+                    data = f.read()
+            except OSError:
+                raise Exception(
+                    'The given config file does not exist'
+                )
             config_json = json.loads(data)
             entities = find_config_entities(config_json, args.config_model)
             if entities is None:
@@ -124,6 +133,8 @@ def main():
             raise Exception(
                 'You have to insert entities manually or use a config file'
             )
+        with open_input_file(args.input) as f:
+            input_file = ner_annotator.LineFile(f)
 
         QApplication.setStyle("fusion")
         app = QApplication(sys.argv)
@@ -3,13 +3,13 @@ Define the main window
 '''
 
 
+import sys
 import json
-import copy
 import math
 import random
 import pickle
 import os
-from functools import partial
+from collections import deque
 
 from PyQt5.QtWidgets import (
     QMainWindow,
@@ -22,16 +22,48 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QMessageBox,
     QSizePolicy,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QHeaderView,
-    QAbstractItemView
+    QAbstractItemView,
+    QShortcut,
+    QProgressDialog
+)
+from PyQt5.QtCore import (
+    Qt,
+    QAbstractTableModel,
+    QModelIndex,
+    QThread,
+    pyqtSignal
+)
+from PyQt5.QtGui import (
+    QIcon,
+    QTextCursor,
+    QTextCharFormat,
+    QColor,
+    QKeySequence
 )
-from PyQt5.QtCore import Qt, QEvent, QSize
-from PyQt5.QtGui import QIcon, QTextCursor, QTextCharFormat, QColor
 
 import ner_annotator
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Icons already loaded from disk, indexed by path
+ICON_CACHE = {}
+
+# Characters which QPlainTextEdit.toPlainText returns differently
+PLAIN_TEXT_TABLE = str.maketrans({
+    '\xa0': ' ',
+    '\r': '\n',
+    '\u2028': '\n',
+    '\u2029': '\n',
+    '\ufdd0': '\n',
+    '\ufdd1': '\n'
+})
+
 
 class AutoGridLayout(QGridLayout):
     '''
@@ -70,6 +102,181 @@ class AutoGridLayout(QGridLayout):
             self.row += 1
 
 
+class AnnotationModel(QAbstractTableModel):
+    '''
+    A table model which stores the entities of the current line
+    as (entity, value, selection start, selection end) tuples
+    '''
+
+    def __init__(self, labels, parent=None):
+        QAbstractTableModel.__init__(self, parent)
+        self.labels = list(labels)
+        self._rows = []
+        self._colors = []
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.labels)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return str(self._rows[index.row()][index.column()])
+        if role == Qt.BackgroundRole:
+            return self._colors[index.row()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.labels[section]
+        return QAbstractTableModel.headerData(self, section, orientation, role)
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if count <= 0 or row < 0 or row + count > len(self._rows):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._rows[row:row + count]
+        del self._colors[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def row(self, row):
+        '''
+        Return the tuple stored at the given row
+        '''
+        return self._rows[row]
+
+    def rows(self):
+        '''
+        Return all the stored tuples
+        '''
+        return self._rows
+
+    def add_rows(self, rows, colors):
+        '''
+        Append the given tuples at once, with the given background colors
+        '''
+        if not rows:
+            return
+        base = len(self._rows)
+        self.beginInsertRows(QModelIndex(), base, base + len(rows) - 1)
+        self._rows.extend(rows)
+        self._colors.extend(colors)
+        self.endInsertRows()
+
+    def set_rows(self, rows, colors):
+        '''
+        Replace all the stored tuples at once
+        '''
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._colors = list(colors)
+        self.endResetModel()
+
+
+class ModelLoader(QThread):
+    '''
+    A thread which loads the given NER model in the background
+    '''
+
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, model_path, parent=None):
+        QThread.__init__(self, parent)
+        self.model_path = model_path
+        self.model = None
+
+    def run(self):
+        try:
+            self.model = ner_annotator.load_model(self.model_path)
+        except Exception as err:
+            self.failed.emit(str(err))
+            return
+        self.loaded.emit(self.model)
+
+
+class ModelClassifier(QThread):
+    '''
+    A thread which classifies, in the background, all the lines
+    of the input file starting from the given one, skipping
+    lines which are already annotated
+    '''
+
+    classified = pyqtSignal(list)
+    progress = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, model, input_file, first_line, annotation_index, batch_size, parent=None):
+        QThread.__init__(self, parent)
+        self.model = model
+        self.input_file = input_file
+        self.first_line = first_line
+        self.annotation_index = annotation_index
+        self.batch_size = batch_size
+
+    def run(self):
+        pending = deque()
+
+        def texts():
+            for i in range(self.first_line, len(self.input_file)):
+                text = plain_text(self.input_file[i])
+                if self.annotation_index(text) is None:
+                    pending.append((i, text))
+                    yield text
+
+        results = []
+        try:
+            for entities in self.model.classify_many(texts(), self.batch_size):
+                line, text = pending.popleft()
+                results.append((text, entities))
+                if len(results) >= self.batch_size:
+                    self.classified.emit(results)
+                    self.progress.emit(line + 1 - self.first_line)
+                    results = []
+                if self.isInterruptionRequested():
+                    break
+        except Exception as err:
+            self.failed.emit(str(err))
+        if results:
+            self.classified.emit(results)
+
+
+def get_icon(icon_path):
+    '''
+    Return the icon stored at the given path, reading it
+    from disk only the first time it is requested
+    '''
+    if icon_path not in ICON_CACHE:
+        ICON_CACHE[icon_path] = QIcon(icon_path)
+    return ICON_CACHE[icon_path]
+
+
+def plain_text(text):
+    '''
+    Return the given text as the content section would return it
+    once displayed, so that it can be used as an annotation key
+    '''
+    return text.replace('\r\n', '\n').translate(PLAIN_TEXT_TABLE)
+
+
+def to_json(data):
+    '''
+    Serialize the given data to JSON bytes, using the faster
+    orjson library when it is installed
+    '''
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+
 def show_dialog(dialog_type, title, text, informative=''):
     '''
     Shows a dialog message
@@ -98,14 +305,16 @@ class NERAnnotator(QMainWindow):
         self.input_file = input_file
         self.output_file = output_file
         self.entities = entities
-        self.model = (
-            ner_annotator.load_model(model_path) if model_path is not None
-            else None
-        )
+        self.model_path = model_path
+        self.model = None
+        self.model_loader = None
+        self.classifier = None
+        self.classify_progress = None
         self.save_pickle = save_pickle
         self.annotations = []
+        self.annotations_index = {}
         self.current_line = 0
-        self.latest_save = []
+        self.dirty = False
 
         # Main layout
         self.central_widget = QWidget(self)
@@ -136,6 +345,7 @@ class NERAnnotator(QMainWindow):
             QSizePolicy.Expanding, QSizePolicy.Expanding
         )
         self.content_text.setReadOnly(True)
+        self.content_text.setUndoRedoEnabled(False)
         self.lines_label = QLabel(self.content_widget)
         self.lines_label.setText(f'Line 1/{len(self.input_file)}')
         self.content_layout.addWidget(self.content_label, 0, Qt.AlignCenter)
@@ -149,24 +359,26 @@ class NERAnnotator(QMainWindow):
             QSizePolicy.Fixed, QSizePolicy.Fixed
         )
         self.entities_layout.addWidget(self.entities_label, 0, Qt.AlignCenter)
-        self.entities_buttons = {}
+        self.entities_buttons = []
+        numbered = len(self.entities) < 10
+        add_button = self.entities_buttons_layout.addNextWidget
         for i, entity in enumerate(self.entities):
-            text = entity
-            if len(self.entities) < 10:
-                text = f'{i + 1}. ' + text
-            self.entities_buttons[entity] = QPushButton(
-                text, self.entities_buttons_widget
+            button = QPushButton(
+                f'{i + 1}. {entity}' if numbered else entity,
+                self.entities_buttons_widget
             )
-            self.entities_buttons[entity].setSizePolicy(
+            button.setSizePolicy(
                 QSizePolicy.Expanding, QSizePolicy.Expanding
             )
-            self.entities_buttons[entity].clicked.connect(
-                partial(self.add_selected_entity, entity)
-            )
-            self.entities_buttons_layout.addNextWidget(
-                self.entities_buttons[entity]
-            )
+            button.clicked.connect(self.entity_handler(entity))
+            add_button(button)
+            self.entities_buttons.append(button)
         self.entities_layout.addWidget(self.entities_buttons_widget)
+        self.hotkeys = {}
+        if numbered:
+            self.hotkeys = {
+                Qt.Key_1 + i: entity for i, entity in enumerate(self.entities)
+            }
 
         # Output section
         self.output_label = QLabel(self.output_widget)
@@ -180,28 +392,34 @@ class NERAnnotator(QMainWindow):
             ner_annotator.SELECTION_START_LABEL: 2,
             ner_annotator.SELECTION_END_LABEL: 3
         }
-        self.output_table = QTableWidget(
-            0, len(self.output_table_labels), self.output_widget
+        self.output_model = AnnotationModel(
+            self.output_table_labels.keys(), self.output_widget
         )
+        self.output_table = QTableView(self.output_widget)
+        self.output_table.setModel(self.output_model)
         self.output_table.setSizePolicy(
             QSizePolicy.Expanding, QSizePolicy.Expanding
         )
-        self.output_table.setHorizontalHeaderLabels(
-            self.output_table_labels.keys()
-        )
         self.output_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.output_table.verticalHeader().setSectionResizeMode(
+            QHeaderView.ResizeToContents
+        )
         self.output_table.horizontalHeader().setSectionResizeMode(
             self.output_table_labels[ner_annotator.ENTITY_LABEL], QHeaderView.Stretch
         )
         self.output_table.horizontalHeader().setSectionResizeMode(
             self.output_table_labels[ner_annotator.VALUE_LABEL], QHeaderView.Stretch
         )
-        self.output_table.horizontalHeader().setSectionResizeMode(
-            self.output_table_labels[ner_annotator.SELECTION_START_LABEL], QHeaderView.ResizeToContents
-        )
-        self.output_table.horizontalHeader().setSectionResizeMode(
-            self.output_table_labels[ner_annotator.SELECTION_END_LABEL], QHeaderView.ResizeToContents
+        selection_width = self.output_table.fontMetrics().horizontalAdvance(
+            '0' * ner_annotator.SELECTION_COLUMN_DIGITS
         )
+        for label in (ner_annotator.SELECTION_START_LABEL, ner_annotator.SELECTION_END_LABEL):
+            self.output_table.horizontalHeader().setSectionResizeMode(
+                self.output_table_labels[label], QHeaderView.Fixed
+            )
+            self.output_table.setColumnWidth(
+                self.output_table_labels[label], selection_width
+            )
         self.output_layout.addWidget(self.output_label, 0, Qt.AlignCenter)
         self.output_layout.addWidget(self.output_table)
 
@@ -211,12 +429,20 @@ class NERAnnotator(QMainWindow):
             function=self.prev,
             parent=self.commands_widget
         )
-        if self.model is not None:
+        if self.model_path is not None:
             self.classify_button = self.set_button(
                 icon_path=ner_annotator.CLASSIFY_ICON_PATH,
                 function=self.classify,
                 parent=self.commands_widget
             )
+            self.classify_all_button = self.set_button(
+                icon_path=ner_annotator.CLASSIFY_ICON_PATH,
+                function=self.classify_all,
+                name='All',
+                parent=self.commands_widget
+            )
+            self.classify_button.setEnabled(False)
+            self.classify_all_button.setEnabled(False)
         self.next_button = self.set_button(
             icon_path=ner_annotator.NEXT_ICON_PATH,
             function=self.next,
@@ -233,12 +459,19 @@ class NERAnnotator(QMainWindow):
             parent=self.commands_widget
         )
         self.commands_layout.addWidget(self.prev_button)
-        if self.model is not None:
+        if self.model_path is not None:
             self.commands_layout.addWidget(self.classify_button)
+            self.commands_layout.addWidget(self.classify_all_button)
         self.commands_layout.addWidget(self.next_button)
         self.commands_layout.addWidget(self.skip_button)
         self.commands_layout.addWidget(self.save_button)
 
+        # Shortcuts
+        self.delete_shortcuts = [
+            QShortcut(QKeySequence(key), self, self.delete_selected_entities)
+            for key in (Qt.Key_Delete, Qt.Key_Backspace)
+        ]
+
         # Main layout
         self.setCentralWidget(self.central_widget)
         self.main_layout.addWidget(self.content_widget)
@@ -246,6 +479,38 @@ class NERAnnotator(QMainWindow):
         self.main_layout.addWidget(self.output_widget)
         self.main_layout.addWidget(self.commands_widget)
 
+        # Load the NER model without blocking the window
+        if self.model_path is not None:
+            self.model_loader = ModelLoader(self.model_path, self)
+            self.model_loader.loaded.connect(self.on_model_loaded)
+            self.model_loader.failed.connect(self.on_model_failed)
+            self.model_loader.start()
+
+    def on_model_loaded(self, model):
+        '''
+        Enable classification once the NER model is loaded
+        '''
+        self.model = model
+        self.classify_button.setEnabled(True)
+        self.classify_all_button.setEnabled(True)
+
+    def on_model_failed(self, error):
+        '''
+        Warn the user that the NER model could not be loaded
+        '''
+        show_dialog(
+            dialog_type=QMessageBox.Critical,
+            title='Error',
+            text='An error occurred while loading the NER model',
+            informative=error
+        )
+
+    def entity_handler(self, entity):
+        '''
+        Return a slot which adds the selected text as the given entity
+        '''
+        return lambda: self.add_selected_entity(entity)
+
     def set_button(self, icon_path, function, name="", parent=None):
         '''
         Configures a QPushButton
@@ -253,10 +518,8 @@ class NERAnnotator(QMainWindow):
         btn = QPushButton(name, parent)
         btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         btn.clicked.connect(function)
-        btn.setIcon(QIcon(icon_path))
-        btn.setIconSize(
-            QSize(ner_annotator.ICON_SIZE, ner_annotator.ICON_SIZE)
-        )
+        btn.setIcon(get_icon(icon_path))
+        btn.setIconSize(ner_annotator.ICON_QSIZE)
         return btn
 
     def skip(self):
@@ -272,19 +535,7 @@ class NERAnnotator(QMainWindow):
             )
             return
         self.current_line += 1
-        self.lines_label.setText(
-            f'Line {self.current_line + 1}/{len(self.input_file)}'
-        )
-        self.content_text.clear()
-        self.content_text.insertPlainText(self.input_file[self.current_line])
-        self.output_table.setRowCount(0)
-        text = self.content_text.toPlainText()
-        index = self.annotation_index(text)
-        if index is not None:
-            for ent in self.annotations[index]['entities']:
-                selection_start, selection_end, entity = ent[0], ent[1], ent[2]
-                value = text[selection_start:selection_end]
-                self.add_entity(entity, selection_start, selection_end, value)
+        self.show_line()
 
     def undo(self):
         '''
@@ -299,49 +550,72 @@ class NERAnnotator(QMainWindow):
             )
             return
         self.current_line -= 1
+        self.show_line()
+
+    def show_line(self):
+        '''
+        Show the current line of the training file,
+        along with its stored annotations
+        '''
         self.lines_label.setText(
             f'Line {self.current_line + 1}/{len(self.input_file)}'
         )
-        self.content_text.clear()
-        self.content_text.insertPlainText(self.input_file[self.current_line])
-        self.output_table.setRowCount(0)
+        self.content_text.setUpdatesEnabled(False)
+        self.output_table.setUpdatesEnabled(False)
+        self.content_text.setPlainText(self.input_file[self.current_line])
+        self.load_entities()
+        self.content_text.setUpdatesEnabled(True)
+        self.output_table.setUpdatesEnabled(True)
+        self.content_text.viewport().update()
+        self.output_table.viewport().update()
+
+    def load_entities(self):
+        '''
+        Fill the output table with the stored annotations
+        of the current line
+        '''
+        rows, colors = [], []
         text = self.content_text.toPlainText()
         index = self.annotation_index(text)
         if index is not None:
             for ent in self.annotations[index]['entities']:
                 selection_start, selection_end, entity = ent[0], ent[1], ent[2]
                 value = text[selection_start:selection_end]
-                self.add_entity(entity, selection_start, selection_end, value)
+                rows.append(
+                    (sys.intern(entity), value, selection_start, selection_end)
+                )
+                colors.append(
+                    self.set_highlighting(selection_start, selection_end)
+                )
+        self.output_model.set_rows(rows, colors)
 
     def record(self):
         '''
         Save the current annotations
         '''
-        entities = []
-        for i in range(self.output_table.rowCount()):
-            ent = self.output_table.item(
-                i, self.output_table_labels[ner_annotator.ENTITY_LABEL]
-            ).text()
-            ss = self.output_table.item(
-                i,  self.output_table_labels[ner_annotator.SELECTION_START_LABEL]
-            ).text()
-            se = self.output_table.item(
-                i,  self.output_table_labels[ner_annotator.SELECTION_END_LABEL]
-            ).text()
-            if ent and ss.isdigit() and se.isdigit():
-                entities.append([int(ss), int(se), ent])
+        entities = [
+            [selection_start, selection_end, entity]
+            for entity, _, selection_start, selection_end in self.output_model.rows()
+        ]
         annotation = {
             'content': self.content_text.toPlainText(),
             'entities': entities
         }
         index = self.annotation_index(annotation['content'])
         if index is None and entities:
+            self.annotations_index[annotation['content']] = len(self.annotations)
             self.annotations.append(annotation)
+            self.dirty = True
         elif index is not None:
             if not entities:
                 del self.annotations[index]
-            else:
+                del self.annotations_index[annotation['content']]
+                for i in range(index, len(self.annotations)):
+                    self.annotations_index[self.annotations[i]['content']] = i
+                self.dirty = True
+            elif self.annotations[index]['entities'] != entities:
                 self.annotations[index]['entities'] = entities
+                self.dirty = True
 
     def annotation_index(self, content):
         '''
@@ -349,10 +623,7 @@ class NERAnnotator(QMainWindow):
         If it does, return its index in the annotations,
         otherwise return None.
         '''
-        for i, ann in enumerate(self.annotations):
-            if ann['content'] == content:
-                return i
-        return None
+        return self.annotations_index.get(plain_text(content))
 
     def next(self):
         '''
@@ -372,9 +643,22 @@ class NERAnnotator(QMainWindow):
         '''
         Save annotations to the output file
         '''
-        if self.latest_save != self.annotations:
+        if self.dirty:
             try:
-                open(self.output_file, 'w').write(json.dumps(self.annotations))
+                with open(self.output_file, 'wb') as f:
+                    f.write(to_json(self.annotations))
+                if self.save_pickle and self.model_path is not None and self.model is None:
+                    # The pickle needs the model: wait for it to be loaded
+                    self.model_loader.wait()
+                    if self.model_loader.model is None:
+                        show_dialog(
+                            dialog_type=QMessageBox.Warning,
+                            title='Warning',
+                            text='The output file was saved, but the pickle file was not',
+                            informative='The NER model could not be loaded'
+                        )
+                        return
+                    self.on_model_loaded(self.model_loader.model)
                 if self.model is not None and self.save_pickle:
                     pickle_file, _ = os.path.splitext(self.output_file)
                     with open(pickle_file, 'wb') as p:
@@ -382,7 +666,7 @@ class NERAnnotator(QMainWindow):
                             self.annotations
                         )
                         pickle.dump(model_annotations, p)
-                self.latest_save = copy.deepcopy(self.annotations)
+                self.dirty = False
                 show_dialog(
                     dialog_type=QMessageBox.Information,
                     title='Success',
@@ -407,11 +691,82 @@ class NERAnnotator(QMainWindow):
         Classify the current text using the given model
         '''
         entities = self.model.classify(self.content_text.toPlainText())
-        for ent in entities:
-            if ent['label'] in self.entities:
-                self.add_entity(
-                    ent['label'], ent['start'], ent['end'], ent['text']
-                )
+        self.add_entities([
+            (ent['label'], ent['start'], ent['end'], ent['text'])
+            for ent in entities if ent['label'] in self.entities
+        ])
+
+    def classify_all(self):
+        '''
+        Classify the current and all the following lines using
+        the given model, without overwriting existing annotations
+        '''
+        self.record()
+        self.classifier = ModelClassifier(
+            self.model, self.input_file, self.current_line,
+            self.annotation_index, ner_annotator.BATCH_SIZE, self
+        )
+        self.classify_progress = QProgressDialog(
+            'Classifying the remaining lines...', 'Cancel',
+            0, len(self.input_file) - self.current_line, self
+        )
+        self.classify_progress.setWindowTitle('Classify')
+        self.classify_progress.setWindowModality(Qt.WindowModal)
+        self.classify_progress.setMinimumDuration(0)
+        self.classify_progress.setAutoClose(False)
+        self.classify_progress.setAutoReset(False)
+        self.classify_progress.canceled.connect(
+            self.classifier.requestInterruption
+        )
+        self.classifier.progress.connect(self.classify_progress.setValue)
+        self.classifier.classified.connect(self.add_classified)
+        self.classifier.failed.connect(self.on_classify_failed)
+        self.classifier.finished.connect(self.on_classify_finished)
+        self.classify_progress.setValue(0)
+        self.classifier.start()
+
+    def add_classified(self, results):
+        '''
+        Store the given (content, entities) classification results,
+        unless their content is already annotated
+        '''
+        for text, ents in results:
+            if self.annotation_index(text) is not None:
+                continue
+            entities = [
+                [ent['start'], ent['end'], sys.intern(ent['label'])]
+                for ent in ents if ent['label'] in self.entities
+            ]
+            if entities:
+                self.annotations_index[text] = len(self.annotations)
+                self.annotations.append({
+                    'content': text,
+                    'entities': entities
+                })
+                self.dirty = True
+
+    def on_classify_failed(self, error):
+        '''
+        Warn the user that the classification could not be completed
+        '''
+        show_dialog(
+            dialog_type=QMessageBox.Critical,
+            title='Error',
+            text='An error occurred while classifying the remaining lines',
+            informative=error
+        )
+
+    def on_classify_finished(self):
+        '''
+        Close the progress dialog and show the classified current line
+        '''
+        self.classify_progress.canceled.disconnect()
+        self.classify_progress.close()
+        self.classify_progress.deleteLater()
+        self.classify_progress = None
+        self.classifier.deleteLater()
+        self.classifier = None
+        self.show_line()
 
     def stop(self):
         '''
@@ -425,7 +780,8 @@ class NERAnnotator(QMainWindow):
         Add the selected entity to the output table
         '''
         cursor = self.content_text.textCursor()
-        value = cursor.selectedText()
+        # Qt separates selected paragraphs with U+2029 instead of newlines
+        value = cursor.selectedText().replace('\u2029', '\n')
         selection_start = cursor.selectionStart()
         selection_end = cursor.selectionEnd()
         self.add_entity(entity, selection_start, selection_end, value)
@@ -434,31 +790,23 @@ class NERAnnotator(QMainWindow):
         '''
         Add the given entity to the output table
         '''
-        if selection_end - selection_start > 0:
-            rows = self.output_table.rowCount()
-            self.output_table.insertRow(rows)
-            self.output_table.setItem(
-                rows,
-                self.output_table_labels[ner_annotator.ENTITY_LABEL],
-                QTableWidgetItem(entity)
-            )
-            self.output_table.setItem(
-                rows,
-                self.output_table_labels[ner_annotator.VALUE_LABEL],
-                QTableWidgetItem(value)
-            )
-            self.output_table.setItem(
-                rows,
-                self.output_table_labels[ner_annotator.SELECTION_START_LABEL],
-                QTableWidgetItem(str(selection_start))
-            )
-            self.output_table.setItem(
-                rows,
-                self.output_table_labels[ner_annotator.SELECTION_END_LABEL],
-                QTableWidgetItem(str(selection_end))
-            )
-            self.output_table.resizeRowsToContents()
-            self.set_highlighting(rows, selection_start, selection_end)
+        self.add_entities([(entity, selection_start, selection_end, value)])
+
+    def add_entities(self, entities):
+        '''
+        Add the given (entity, selection start, selection end, value)
+        tuples to the output table at once
+        '''
+        rows, colors = [], []
+        for entity, selection_start, selection_end, value in entities:
+            if selection_end - selection_start > 0:
+                rows.append(
+                    (sys.intern(entity), value, selection_start, selection_end)
+                )
+                colors.append(
+                    self.set_highlighting(selection_start, selection_end)
+                )
+        self.output_model.add_rows(rows, colors)
 
     def highlight(self, selection_start, selection_end, color):
         '''
@@ -481,11 +829,11 @@ class NERAnnotator(QMainWindow):
                 )
         cursor.setCharFormat(fmt)
 
-    def set_highlighting(self, output_row, selection_start, selection_end):
+    def set_highlighting(self, selection_start, selection_end):
         '''
-        Color selected text and the corresponding row in the output table
+        Color selected text and return the color to be used
+        for the corresponding row in the output table
         '''
-        # Color selected text
         color = [
             random.randint(0, 255),
             random.randint(0, 255),
@@ -493,47 +841,48 @@ class NERAnnotator(QMainWindow):
             80
         ]
         self.highlight(selection_start, selection_end, color)
-
-        # Color entire row in output table
-        for output_col in self.output_table_labels.values():
-            self.output_table.item(output_row, output_col).setBackground(
-                QColor(color[0], color[1], color[2], 80)
-            )
+        return QColor(color[0], color[1], color[2], 80)
 
     def clear_highlighting(self, output_row):
         '''
         Remove highlighting from text when removing 
         corresponding entity in output table
         '''
-        selection_start = self.output_table.item(
-            output_row, self.output_table_labels[ner_annotator.SELECTION_START_LABEL]
-        ).text()
-        selection_end = self.output_table.item(
-            output_row, self.output_table_labels[ner_annotator.SELECTION_END_LABEL]
-        ).text()
+        _, _, selection_start, selection_end = self.output_model.row(output_row)
         self.highlight(selection_start, selection_end, "transparent")
 
+    def delete_selected_entities(self):
+        '''
+        Remove the selected entities from the output table
+        '''
+        select = self.output_table.selectionModel()
+        rows = sorted(
+            (index.row() for index in select.selectedRows()), reverse=True
+        )
+        for row in rows:
+            self.clear_highlighting(row)
+            self.output_model.removeRow(row)
+
     def keyPressEvent(self, event):
-        if event.type() == QEvent.KeyPress and event.key() in (Qt.Key_Delete, Qt.Key_Backspace):
-            select = self.output_table.selectionModel()
-            for index in select.selectedRows():
-                self.clear_highlighting(index.row())
-                self.output_table.removeRow(index.row())
-        elif event.type() == QEvent.KeyPress and event.key() in range(Qt.Key_1, Qt.Key_9):
-            if len(self.entities) < 10:
-                index = int(event.key()) - 48
-                self.add_selected_entity(self.entities[index - 1])
+        entity = self.hotkeys.get(event.key())
+        if entity is not None:
+            self.add_selected_entity(entity)
+        else:
+            QMainWindow.keyPressEvent(self, event)
 
     def closeEvent(self, event):
         self.record()
-        if self.latest_save != self.annotations:
+        if self.dirty:
             quit_msg = "You have unsaved work. Would you like to save it before leaving?"
             reply = QMessageBox.question(
                 self, 'Save before exit', quit_msg, QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel
             )
             if reply == QMessageBox.Yes:
                 self.save()
-                event.accept()
+                if self.dirty:
+                    event.ignore()
+                else:
+                    event.accept()
             elif reply == QMessageBox.Cancel:
                 event.ignore()
             else:
@@ -547,3 +896,8 @@ class NERAnnotator(QMainWindow):
                 event.accept()
             else:
                 event.ignore()
+        if event.isAccepted():
+            for thread in (self.model_loader, self.classifier):
+                if thread is not None:
+                    thread.requestInterruption()
+                    thread.wait()
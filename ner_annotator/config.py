@@ -4,14 +4,15 @@ Store configuration values
 
 
 from pkg_resources import resource_filename
+from os import environ
 from os.path import abspath
 
-from PyQt5.QtCore import QFile
+from PyQt5.QtCore import QFile, QSize
 
 
 # Input/output formats
-VALID_IN_FMT = ('.txt')
-VALID_OUT_FMT = ('.json')
+VALID_IN_FMT = ('.txt',)
+VALID_OUT_FMT = ('.json',)
 
 # Output table labels
 ENTITY_LABEL = 'Entity'
@@ -19,6 +20,9 @@ VALUE_LABEL = 'Value'
 SELECTION_START_LABEL = 'Start'
 SELECTION_END_LABEL = 'End'
 
+# Number of digits the selection start/end columns are sized for
+SELECTION_COLUMN_DIGITS = 7
+
 # CSS
 STYLE = ""
 STYLE_FILE_PATH = abspath(resource_filename(
@@ -45,6 +49,14 @@ CLASSIFY_ICON_PATH = abspath(resource_filename(
     'ner_annotator.resources.icons', 'categorize.png'
 ))
 ICON_SIZE = 64
+ICON_QSIZE = QSize(ICON_SIZE, ICON_SIZE)
+
+# Number of lines to be classified at once by the NER model
+BATCH_SIZE = 64
+try:
+    BATCH_SIZE = max(1, int(environ.get('NER_ANNOTATOR_BATCH_SIZE', 64)))
+except ValueError:
+    pass
 
 # Main window
 WINDOW_TITLE = "NER Annotator"
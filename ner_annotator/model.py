@@ -3,9 +3,15 @@ Define NER models to classify entities and convert JSON data
 '''
 
 
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
 def load_model(model_path):
     '''
-    Try to load the correct NER model
+    Try to load the correct NER model.
+    Loaded models are cached, so that loading the same path
+    again does not hit the disk
     '''
     model = None
     correct_subclass = None
@@ -68,6 +74,16 @@ class NERModel(object):
         '''
         raise NotImplementedError
 
+    def classify_many(self, texts, batch_size):
+        '''
+        Classify each of the given texts and lazily return the retrieved
+        entities, in the same order as the given texts. The texts can be
+        any iterable and should be consumed only as results are requested.
+        Each yielded element should be an array with the same schema as
+        the one returned by `classify`
+        '''
+        return (self.classify(text) for text in texts)
+
     def from_json(self, annotations):
         '''
         Convert JSON data to model data
@@ -77,6 +93,9 @@ class NERModel(object):
 
 class SpaCyNERModel(NERModel):
 
+    # Pipeline components which are not needed to extract entities
+    DISABLED_PIPES = ['tagger', 'parser', 'attribute_ruler', 'lemmatizer']
+
     def __init__(self, model_path, model=None):
         super(SpaCyNERModel, self).__init__(model_path, model)
 
@@ -84,7 +103,7 @@ class SpaCyNERModel(NERModel):
     def _load_model(cls, model_path):
         try:
             import spacy
-            return spacy.load(model_path)
+            return spacy.load(model_path, disable=cls.DISABLED_PIPES)
         except:
             return None
 
@@ -94,9 +113,11 @@ class SpaCyNERModel(NERModel):
                 return True
         return False
 
-    def classify(self, text):
+    def _doc_entities(self, doc):
+        '''
+        Return the entities contained in the given SpaCy document
+        '''
         entities = []
-        doc = self.model(text)
         for ent in doc.ents:
             entities.append({
                 'label': ent.label_,
@@ -106,6 +127,15 @@ class SpaCyNERModel(NERModel):
             })
         return entities
 
+    def classify(self, text):
+        return self._doc_entities(self.model(text))
+
+    def classify_many(self, texts, batch_size):
+        return (
+            self._doc_entities(doc)
+            for doc in self.model.pipe(texts, batch_size=batch_size)
+        )
+
     def from_json(self, annotations):
         '''
         Convert JSON data to SpaCy data
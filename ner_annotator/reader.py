@@ -0,0 +1,118 @@
+'''
+Read training text files without loading them into memory
+'''
+
+
+import os
+import re
+import mmap
+import locale
+from array import array
+from itertools import accumulate, chain
+
+
+# Number of bytes scanned at once when indexing lines
+BLOCK_SIZE = 1 << 20
+
+# Line boundaries recognized by str.splitlines, other than \n and \r
+EXTRA_SEPARATORS = '\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+NEWLINE = re.compile(b'[\r\n]')
+
+
+class LineFile(object):
+    '''
+    A read-only sequence of the lines of a text file.
+    The file is memory-mapped and only the offsets of its lines
+    are kept in memory, so that each line is decoded when accessed.
+    Lines are split like str.splitlines would do and the whole file
+    is checked to be decodable when indexing it
+    '''
+
+    def __init__(self, file, encoding=None):
+        self.encoding = (
+            encoding if encoding is not None
+            else locale.getpreferredencoding(False)
+        )
+        self._separators = []
+        for separator in EXTRA_SEPARATORS:
+            try:
+                self._separators.append(separator.encode(self.encoding))
+            except UnicodeEncodeError:
+                pass
+        self._data = b''
+        self._size = os.fstat(file.fileno()).st_size
+        if self._size > 0:
+            self._data = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        self._starts = self._find_lines()
+
+    def _block_end(self, start):
+        '''
+        Return the end offset of the block beginning at the given offset,
+        so that the block ends with a line terminator
+        '''
+        end = start + BLOCK_SIZE
+        if end >= self._size:
+            return self._size
+        cut = max(
+            self._data.rfind(b'\n', start, end),
+            self._data.rfind(b'\r', start, end)
+        )
+        if cut == -1:
+            match = NEWLINE.search(self._data, end)
+            if match is None:
+                return self._size
+            cut = match.start()
+        end = cut + 1
+        if self._data[cut:end] == b'\r' and self._data[end:end + 1] == b'\n':
+            end += 1
+        return end
+
+    def _find_lines(self):
+        '''
+        Compute the start offset of each line, decoding the file
+        block by block to make sure that it is valid
+        '''
+        starts = array('q')
+        start = 0
+        while start < self._size:
+            end = self._block_end(start)
+            block = self._data[start:end]
+            try:
+                text = block.decode(self.encoding)
+            except UnicodeDecodeError as err:
+                line = len(starts) + len((block[:err.start] + b'x').splitlines())
+                raise Exception(
+                    f'The input file could not be decoded as {self.encoding} '
+                    f'(invalid data at line {line})'
+                )
+            if len(text) == len(block):
+                # One byte per character: offsets match the decoded text
+                lengths = map(len, text.splitlines(True))
+            elif any(separator in block for separator in self._separators):
+                lengths = [
+                    len(line.encode(self.encoding))
+                    for line in text.splitlines(True)
+                ]
+            else:
+                lengths = map(len, block.splitlines(True))
+            starts.extend(accumulate(chain((start,), lengths)))
+            starts.pop()
+            start = end
+        return starts
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('line index out of range')
+        end = (
+            self._starts[index + 1] if index + 1 < len(self)
+            else self._size
+        )
+        line = self._data[self._starts[index]:end].decode(self.encoding)
+        return (line.splitlines() or [''])[0]
@@ -15,7 +15,8 @@ with open("requirements.txt", "r") as fh:
     install_requires = fh.read().splitlines()
 
 extras_require = {
-    "spacy": ["spacy==2.2.4"]
+    "spacy": ["spacy==2.2.4"],
+    "orjson": ["orjson"]
 }
 
 